@@ -1,9 +1,13 @@
 import pytest
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
+import json
 import os
 
 APP_ID = "bs://664aa316b184a8060e44cfbfa1477881660cf7a7"
+APP_PACKAGE = "org.wikipedia.alpha"
+DEFAULT_BUILD_NAME = "Automate Build #123"
+DEFAULT_PROJECT_NAME = "bs-demo-cert"
 
 devices = [
     {
@@ -16,28 +20,108 @@ devices = [
     }
 ]
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "requires_fresh_install: run the test on its own newly created driver session",
+    )
+    config.addinivalue_line("markers", "xdist_group(name): run tests of one group on the same worker")
+
 def get_driver(device, test_name):
     options = UiAutomator2Options()
     options.set_capability("platformName", "Android")
     options.set_capability("deviceName", device["deviceName"])
     options.set_capability("platformVersion", device["platformVersion"])
     options.set_capability("app", APP_ID)
+    options.set_capability("appium:disableWindowAnimation", True)
     options.set_capability("bstack:options", {
-        "projectName": "bs-demo-cert",
-        "buildName": "Automate Build #123",
+        # Constant fallbacks keep every xdist worker reporting into the same build
+        "projectName": os.environ.get("BROWSERSTACK_PROJECT_NAME", DEFAULT_PROJECT_NAME),
+        "buildName": os.environ.get("BROWSERSTACK_BUILD_NAME", DEFAULT_BUILD_NAME),
         "sessionName": test_name,
         "userName": os.environ["BROWSERSTACK_USERNAME"],
         "accessKey": os.environ["BROWSERSTACK_ACCESS_KEY"]
     })
 
-    return webdriver.Remote(
+    driver = webdriver.Remote(
         command_executor="https://hub-cloud.browserstack.com/wd/hub",
         options=options
     )
+    # Rely on explicit waits only; an implicit wait multiplies wire calls per find
+    driver.implicitly_wait(0)
+    # Skip the UiAutomator2 idle wait before every lookup
+    driver.update_settings({"waitForIdleTimeout": 0})
+    return driver
+
+def annotate(driver, text):
+    driver.execute_script(
+        'browserstack_executor: {"action": "annotate", "arguments": {"data": %s, "level": "info"}}'
+        % json.dumps(text)
+    )
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    # Keep each device's tests on one xdist worker (--dist loadgroup) so the
+    # module-scoped session is actually reused
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec and "device" in callspec.params:
+            item.add_marker(pytest.mark.xdist_group(callspec.params["device"]["deviceName"]))
+
+    # Run requires_fresh_install tests last in their module: the shared session
+    # is then quit once for them and never has to be rebuilt afterwards
+    modules = {}
+    for item in items:
+        modules.setdefault(item.module, len(modules))
+    items.sort(key=lambda item: (
+        modules[item.module],
+        item.get_closest_marker("requires_fresh_install") is not None,
+    ))
 
-@pytest.fixture(params=devices, scope="function")
-def driver(request):
-    device = request.param
-    driver = get_driver(device, request.node.name)
+@pytest.fixture(params=devices, scope="module")
+def device(request):
+    return request.param
+
+@pytest.fixture(scope="module")
+def shared_session(request, device):
+    # One BrowserStack session per module and device amortizes allocation + install.
+    # Created lazily by `driver`, and quit before the module's fresh-install tests.
+    session = {
+        "driver": None,
+        "name": f"{request.module.__name__}[{device['deviceName']}]",
+        "dirty": False,
+    }
+    yield session
+    if session["driver"] is not None:
+        session["driver"].quit()
+
+@pytest.fixture
+def driver(request, device, shared_session):
+    if request.node.get_closest_marker("requires_fresh_install"):
+        # Free the shared slot rather than leaving it idle next to a second session
+        if shared_session["driver"] is not None:
+            shared_session["driver"].quit()
+            shared_session["driver"] = None
+        driver = get_driver(device, request.node.name)
+        yield driver
+        driver.quit()
+        return
+
+    if shared_session["driver"] is None:
+        shared_session["driver"] = get_driver(device, shared_session["name"])
+        shared_session["dirty"] = False
+    driver = shared_session["driver"]
+    # The session keeps its module[device] name; mark where each test begins
+    annotate(driver, f"Start: {request.node.name}")
     yield driver
-    driver.quit()
+    shared_session["dirty"] = True
+
+@pytest.fixture
+def reset_app(driver, shared_session):
+    # Clear app data left by an earlier test on the shared session. A session
+    # that has not run a test yet (or a fresh-install one) is already clean.
+    if driver is shared_session["driver"] and shared_session["dirty"]:
+        # clearApp force-stops the app before wiping its data
+        driver.execute_script("mobile: clearApp", {"appId": APP_PACKAGE})
+        driver.activate_app(APP_PACKAGE)
+        shared_session["dirty"] = False